@@ -1,10 +1,21 @@
 #!/usr/bin/env python
+from __future__ import annotations
+
 import re
 import inspect
-from typing import Any, Dict, Set
-from cdktf import TerraformStack, TerraformOutput
-from imports.aws.provider import AwsProvider
+import functools
+from typing import TYPE_CHECKING, Any, Dict, List, Set
 import importlib
+import logging
+
+from config import AWSResource
+
+# cdktf and the generated provider bindings load the large jsii assembly, so
+# they are imported where first needed rather than when this module loads
+if TYPE_CHECKING:
+    from cdktf import TerraformStack
+
+logger = logging.getLogger(__name__)
 
 # AWS region abbreviations for consistent naming
 AWS_REGION_ABBREVIATIONS = {
@@ -35,45 +46,194 @@ AWS_REGION_ABBREVIATIONS = {
     "cn-northwest-1": "cnnw1",
 }
 
+# Map service names that differ between Pulumi and CDKTF
+SERVICE_MODULE_MAP = {
+    "vpc": "vpc",
+    "ec2": "instance",
+    "s3": "s3_bucket",
+    "s3_bucket": "s3_bucket",
+    "iam": "iam_role",
+    "lambda": "lambda_function",
+    "apigateway": "api_gateway_rest_api",
+    "apigatewayv2": "apigatewayv2_api",
+    "dynamodb": "dynamodb_table",
+    "cloudfront": "cloudfront_distribution",
+    "cloudwatch": "cloudwatch_dashboard",
+    "cognito": "cognito_user_pool",
+    "sqs": "sqs_queue",
+    "ssm": "ssm_parameter",
+    "bedrock": "bedrock_agent",
+}
+
+# Resource types (lowercased) that explicitly support tags
+TAG_SUPPORTING_RESOURCES = frozenset({
+    "s3_bucket.s3bucket",
+    "lambda_function.lambdafunction",
+    "dynamodb_table.dynamodbtable",
+    "api_gateway_rest_api.apigatewayrestapi",
+    "cognito_user_pool.cognitouserpool",
+    "sqs_queue.sqsqueue",
+    "apigatewayv2_api.apigatewayv2api",
+    "ssm_parameter.ssmparameter",
+    "iam_role.iamrole",
+    "cloudfront_distribution.cloudfrontdistribution",
+})
+
+# Sentinel for attribute lookups where None is a valid value
+_MISSING = object()
+
+# Boundary before each interior capital letter, used by to_snake_case
+_SNAKE_CASE_RE = re.compile(r'(?<!^)(?=[A-Z])')
+
+@functools.lru_cache(maxsize=2048)
 def to_snake_case(name: str) -> str:
     """Convert a camel case string to snake case."""
-    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
+    return _SNAKE_CASE_RE.sub('_', name).lower()
 
-def resolve_value(value: Any, resources: Dict[str, Any]) -> Any:
-    """Resolve referenced values in the configuration."""
-    if isinstance(value, dict):
-        return {k: resolve_value(v, resources) for k, v in value.items()}
-    elif isinstance(value, list):
-        return [resolve_value(item, resources) for item in value]
-    elif isinstance(value, str):
-        if value.startswith("secret:"):
-            # In a real implementation, this would fetch from Terraform variables
-            secret_key = value[len("secret:"):]
-            # Placeholder for secret resolution
-            print(f"WARNING: Secret references like {secret_key} are not fully implemented")
-            return f"${{{secret_key}}}"
-        elif value.startswith("ref:"):
-            ref_text = value[4:]
-            if "." in ref_text:
-                ref_res, ref_attr = ref_text.split(".", 1)
-            else:
-                ref_res, ref_attr = ref_text, "id"
-            if ref_res not in resources:
-                raise ValueError(f"Referenced resource '{ref_res}' not found.")
-            
-            resource_obj = resources[ref_res]
-            # In CDKTF, we need to use the appropriate property references
-            try:
-                # Try to access the attribute directly as a property
-                return getattr(resource_obj, ref_attr)
-            except AttributeError:
-                # Some CDKTF resource types might have different attribute access patterns
-                print(f"WARNING: Attribute '{ref_attr}' not found directly on resource '{ref_res}'")
-                return resource_obj.get_string(ref_attr)
-        else:
-            return value
+def _resolve_secret(secret_key: str, resources: Dict[str, Any]) -> Any:
+    """Resolve a secret:<key> reference."""
+    # In a real implementation, this would fetch from Terraform variables
+    # Placeholder for secret resolution
+    logger.warning("Secret references like %s are not fully implemented", secret_key)
+    return f"${{{secret_key}}}"
+
+def _resolve_ref(ref_text: str, resources: Dict[str, Any]) -> Any:
+    """Resolve a ref:<resource>[.<attribute>] reference to a created resource."""
+    if "." in ref_text:
+        ref_res, ref_attr = ref_text.split(".", 1)
     else:
+        ref_res, ref_attr = ref_text, "id"
+    if ref_res not in resources:
+        raise ValueError(f"Referenced resource '{ref_res}' not found.")
+    
+    resource_obj = resources[ref_res]
+    # In CDKTF, we need to use the appropriate property references
+    # Try to access the attribute directly as a property
+    attr_value = getattr(resource_obj, ref_attr, _MISSING)
+    if attr_value is not _MISSING:
+        return attr_value
+    # Some CDKTF resource types might have different attribute access patterns
+    logger.warning("Attribute '%s' not found directly on resource '%s'", ref_attr, ref_res)
+    return resource_obj.get_string(ref_attr)
+
+# Handlers for "<prefix>:<text>" string references, keyed by prefix
+_STRING_PREFIX_HANDLERS = {
+    "secret": _resolve_secret,
+    "ref": _resolve_ref,
+}
+_REFERENCE_PREFIXES = tuple(f"{prefix}:" for prefix in _STRING_PREFIX_HANDLERS)
+
+def _resolve_string(value: str, resources: Dict[str, Any]) -> Any:
+    """Resolve a single string value, expanding any prefixed reference."""
+    idx = value.find(":")
+    if idx < 0:
+        return value
+    handler = _STRING_PREFIX_HANDLERS.get(value[:idx])
+    if handler is None:
         return value
+    return handler(value[idx + 1:], resources)
+
+def _enter_container(node: Any, path: List[int], on_path: Set[int]) -> None:
+    """Record a container on the current traversal path, rejecting cycles."""
+    node_id = id(node)
+    if node_id in on_path:
+        raise ValueError("Configuration value contains itself (recursive YAML alias).")
+    path.append(node_id)
+    on_path.add(node_id)
+
+def has_references(value: Any) -> bool:
+    """Return True if any string in value is a secret: or ref: reference.
+    
+    A value that contains itself raises ValueError.
+    """
+    # Each entry carries its depth so the path of containers above it is known
+    stack = [(value, 0)]
+    path: List[int] = []
+    on_path: Set[int] = set()
+    while stack:
+        node, depth = stack.pop()
+        while len(path) > depth:
+            on_path.discard(path.pop())
+        node_type = type(node)
+        if node_type is dict:
+            _enter_container(node, path, on_path)
+            stack.extend((child, depth + 1) for child in node.values())
+        elif node_type is list:
+            _enter_container(node, path, on_path)
+            stack.extend((child, depth + 1) for child in node)
+        elif node_type is str:
+            if node.startswith(_REFERENCE_PREFIXES):
+                return True
+        # Subclasses such as OrderedDict take the slower isinstance path
+        elif isinstance(node, dict):
+            _enter_container(node, path, on_path)
+            stack.extend((child, depth + 1) for child in node.values())
+        elif isinstance(node, list):
+            _enter_container(node, path, on_path)
+            stack.extend((child, depth + 1) for child in node)
+        elif isinstance(node, str):
+            if node.startswith(_REFERENCE_PREFIXES):
+                return True
+    return False
+
+def resolve_value(value: Any, resources: Dict[str, Any]) -> Any:
+    """Resolve referenced values in the configuration.
+
+    Nested dicts and lists are walked with an explicit stack rather than
+    recursion, and copied on the way so the original configuration is
+    never mutated. A value that contains itself raises ValueError.
+    """
+    # Holder for the resolved root so it can be written back like any child
+    root = [value]
+    # Each entry carries its depth so the path of containers above it is known
+    stack = [(root, 0, value, 0)]
+    path: List[int] = []
+    on_path: Set[int] = set()
+    while stack:
+        parent, key, node, depth = stack.pop()
+        while len(path) > depth:
+            on_path.discard(path.pop())
+        # Exact type checks first: parsed YAML only yields plain dict, list and str
+        node_type = type(node)
+        if node_type is dict:
+            _enter_container(node, path, on_path)
+            node_copy = dict(node)
+            parent[key] = node_copy
+            # Push in reverse so children are resolved in their original order
+            for k in reversed(node_copy):
+                stack.append((node_copy, k, node_copy[k], depth + 1))
+        elif node_type is list:
+            _enter_container(node, path, on_path)
+            node_copy = list(node)
+            parent[key] = node_copy
+            for i in range(len(node_copy) - 1, -1, -1):
+                stack.append((node_copy, i, node_copy[i], depth + 1))
+        elif node_type is str:
+            # Inlined _resolve_string: plain strings (CIDRs, names, AZs) have
+            # no prefix and are left as-is after a single scan for ":"
+            idx = node.find(":")
+            if idx >= 0:
+                handler = _STRING_PREFIX_HANDLERS.get(node[:idx])
+                if handler is not None:
+                    parent[key] = handler(node[idx + 1:], resources)
+        elif isinstance(node, (dict, list)):
+            # Subclasses such as OrderedDict are re-queued as plain containers,
+            # one level down so the original stays on the path
+            _enter_container(node, path, on_path)
+            node_copy = dict(node) if isinstance(node, dict) else list(node)
+            stack.append((parent, key, node_copy, depth + 1))
+        elif isinstance(node, str):
+            # str subclasses, e.g. ruamel's quoted scalars
+            resolved = _resolve_string(node, resources)
+            if resolved is not node:
+                parent[key] = resolved
+    return root[0]
+
+@functools.lru_cache(maxsize=64)
+def region_abbreviation(region: str) -> str:
+    """Get the standard abbreviation for an AWS region."""
+    region = region.lower()
+    return AWS_REGION_ABBREVIATIONS.get(region, region.split("-")[0])
 
 def get_lookup_params(required_params: Set, resolved_args: dict) -> dict:
     """Extract parameters needed for data source lookups."""
@@ -93,78 +253,76 @@ class AWSResourceBuilder:
         self.stack = stack
         self.config = config_data
         self.resources: Dict[str, Any] = {}
+        # Provider classes already imported, keyed by (module_name, class_name, is_data)
+        self._class_cache: Dict[tuple, type] = {}
+        
+        # Naming prefix shared by every generated resource name
+        team = self.config.get("team", "team").strip().lower()
+        service = self.config.get("service", "svc").strip().lower()
+        env = self.config.get("environment", "dev").strip().lower()
+        self._reg_abbr = self.get_abbreviation(self.config.get("region", "us-east-1"))
+        self._name_prefix = f"{team}-{service}-{env}-{self._reg_abbr}-"
         
         # Add AWS Provider
+        from imports.aws.provider import AwsProvider
         AwsProvider(self.stack, "aws",
                    region=self.config.get("region", "us-east-1"))
 
     def get_abbreviation(self, region: str) -> str:
         """Get the standard abbreviation for an AWS region."""
-        return AWS_REGION_ABBREVIATIONS.get(region.lower(), region.split("-")[0].lower())
+        return region_abbreviation(region)
 
     def generate_resource_name(self, base_name: str) -> str:
         """Generate a standardized resource name."""
-        team = self.config.get("team", "team").strip().lower()
-        service = self.config.get("service", "svc").strip().lower()
-        env = self.config.get("environment", "dev").strip().lower()
-        reg_abbr = self.get_abbreviation(self.config.get("region", "us-east-1"))
-        return f"{team}-{service}-{env}-{reg_abbr}-{base_name}".lower()
+        return f"{self._name_prefix}{base_name}".lower()
 
     def resolve_args(self, args: dict) -> dict:
         """Resolve all argument values, including references."""
-        return {key: resolve_value(value, self.resources) for key, value in args.items()}
+        # One traversal over the whole argument tree (resolve_value returns a copy)
+        return resolve_value(args, self.resources)
 
     def _apply_common_parameters(self, resolved_args: dict, resource_type: str) -> dict:
         """Apply common parameters to resource arguments based on resource type."""
-        # Resources that explicitly support tags
-        tag_supporting_resources = [
-            "s3_bucket.s3bucket",
-            "lambda_function.lambdafunction", 
-            "dynamodb_table.dynamodbtable",
-            "api_gateway_rest_api.apigatewayrestapi",
-            "cognito_user_pool.cognitouserpool",
-            "sqs_queue.sqsqueue",
-            "apigatewayv2_api.apigatewayv2api",
-            "ssm_parameter.ssmparameter",
-            "iam_role.iamrole",
-            "cloudfront_distribution.cloudfrontdistribution"
-        ]
-        
         # Check if the resource supports tags
-        resource_type_lower = resource_type.lower()
-        supports_tags = any(tag_resource.lower() in resource_type_lower for tag_resource in tag_supporting_resources)
+        supports_tags = resource_type.lower() in TAG_SUPPORTING_RESOURCES
         
         if supports_tags:
             resource_tags = self.config.get("tags", {})
-            if resource_tags:
-                resolved_args.setdefault("tags", resource_tags)
+            if resource_tags and "tags" not in resolved_args:
+                # Build a new dict: resolved_args may be the config's own args
+                resolved_args = {**resolved_args, "tags": resource_tags}
                 
         return resolved_args
 
     def build(self):
         """Build all AWS resources defined in the configuration."""
-        aws_resources = self.config.get("aws_resources", [])
+        aws_resources = [AWSResource.from_dict(resource_cfg)
+                         for resource_cfg in self.config.get("aws_resources", [])]
+        
+        # Phase 1: import every distinct resource class before building anything
+        classes, import_errors = self._import_resource_classes(aws_resources)
         
+        # Phase 2: instantiate resources in configuration order
         for resource_cfg in aws_resources:
-            name = resource_cfg["name"]
-            resource_type = resource_cfg["type"]
-            args = resource_cfg.get("args", {}).copy()
-            custom_name = resource_cfg.get("custom_name", None)
-            is_existing = args.pop("existing", False)
+            name = resource_cfg.name
+            resource_type = resource_cfg.type
+            args = resource_cfg.args
+            custom_name = resource_cfg.custom_name
+            is_existing = resource_cfg.existing
+            
+            # Resolve any reference variables in the arguments; pure literals
+            # are used as-is and never mutated from here on
+            resolved_args = self.resolve_args(args) if has_references(args) else args
             
-            # Resolve any reference variables in the arguments
-            resolved_args = self.resolve_args(args)
+            # Resource or data source class imported in phase 1
+            class_key = (resource_type, is_existing)
+            ResourceClass = classes.get(class_key)
+            if ResourceClass is None:
+                logger.error("Error creating resource '%s' of type '%s': %s",
+                             name, resource_type, import_errors[class_key])
+                continue
             
-            # Import the appropriate module based on resource type
             try:
-                # The format in cdktf-provider-aws is different from Pulumi
-                # We need to map from resource_type to the correct import path
-                module_name, class_name = self._map_resource_type(resource_type)
-                
-                # Try to import the module
-                module = importlib.import_module(f"imports.aws.{module_name}")
-                ResourceClass = getattr(module, class_name)
-                
                 # Generate a resource name following conventions
                 terraform_name = custom_name if custom_name else self.generate_resource_name(name)
                 
@@ -173,30 +331,73 @@ class AWSResourceBuilder:
                 
                 # Handle data sources (existing resources)
                 if is_existing:
-                    # For existing resources, we should use a data source
-                    data_source_module = importlib.import_module(f"imports.aws.{module_name}_data")
-                    DataClass = getattr(data_source_module, f"{class_name}Data")
-                    
-                    # Create the data source
-                    self.resources[name] = DataClass(self.stack, name, **resolved_args)
-                    print(f"Created data source for: {terraform_name} ({resource_type})")
+                    # For existing resources, ResourceClass is the data source
+                    self.resources[name] = ResourceClass(self.stack, name, **resolved_args)
+                    logger.debug("Created data source for: %s (%s)", terraform_name, resource_type)
                 else:
                     # Create a new resource
                     self.resources[name] = ResourceClass(self.stack, name, **resolved_args)
-                    print(f"Created resource: {terraform_name} ({resource_type})")
+                    logger.debug("Created resource: %s (%s)", terraform_name, resource_type)
                 
             except (ImportError, AttributeError) as e:
-                print(f"Error creating resource '{name}' of type '{resource_type}': {e}")
+                logger.error("Error creating resource '%s' of type '%s': %s", name, resource_type, e)
                 continue
         
         # Export created resources as outputs
+        from cdktf import TerraformOutput
+        skipped = []
         for name, resource in self.resources.items():
+            resource_id = getattr(resource, "id", None)
+            if resource_id is None:
+                skipped.append(name)
+                continue
+            TerraformOutput(self.stack, "output_" + name, value=resource_id)
+        if skipped:
+            logger.warning("No 'id' to export for resources: %s", ", ".join(skipped))
+
+    def _import_resource_classes(self, aws_resources: List[AWSResource]) -> tuple:
+        """Import the class for each distinct resource type in the configuration.
+        
+        Existing resources need the data source class instead of the resource
+        class, so both dicts of the returned (classes, import_errors) pair are
+        keyed by (resource_type, is_existing).
+        """
+        classes: Dict[tuple, type] = {}
+        import_errors: Dict[tuple, Exception] = {}
+        for resource_cfg in aws_resources:
+            is_existing = resource_cfg.existing
+            class_key = (resource_cfg.type, is_existing)
+            if class_key in classes or class_key in import_errors:
+                continue
+            # The format in cdktf-provider-aws is different from Pulumi
+            # We need to map from resource_type to the correct import path
+            module_name, class_name = self._map_resource_type(resource_cfg.type)
             try:
-                TerraformOutput(self.stack, f"output_{name}", value=resource.id)
-            except Exception as e:
-                print(f"Failed to export resource '{name}': {e}")
+                classes[class_key] = self._load_class(module_name, class_name, is_existing)
+            except (ImportError, AttributeError) as e:
+                import_errors[class_key] = e
+        return classes, import_errors
+
+    def _load_class(self, module_name: str, class_name: str, is_data: bool = False) -> type:
+        """Import a provider class from imports.aws, reusing earlier imports.
+        
+        With is_data, the data source variant ({module}_data.{Class}Data) is loaded.
+        """
+        key = (module_name, class_name, is_data)
+        cls = self._class_cache.get(key)
+        if cls is None:
+            if is_data:
+                module = importlib.import_module(f"imports.aws.{module_name}_data")
+                cls = getattr(module, f"{class_name}Data")
+            else:
+                module = importlib.import_module(f"imports.aws.{module_name}")
+                cls = getattr(module, class_name)
+            self._class_cache[key] = cls
+        return cls
 
-    def _map_resource_type(self, resource_type: str) -> tuple:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _map_resource_type(resource_type: str) -> tuple:
         """Map Pulumi resource type to CDKTF resource type."""
         # Example mapping from Pulumi to CDKTF
         # In Pulumi: "ec2.Vpc" -> In CDKTF: from imports.aws.vpc import Vpc
@@ -208,27 +409,9 @@ class AWSResourceBuilder:
             # Default to EC2 if no service specified
             service, class_name = "ec2", resource_type
             
-        # Map service names that differ between Pulumi and CDKTF
-        service_map = {
-            "vpc": "vpc",
-            "ec2": "instance",
-            "s3": "s3_bucket",
-            "s3_bucket": "s3_bucket",
-            "iam": "iam_role",
-            "lambda": "lambda_function",
-            "apigateway": "api_gateway_rest_api",
-            "apigatewayv2": "apigatewayv2_api",
-            "dynamodb": "dynamodb_table",
-            "cloudfront": "cloudfront_distribution",
-            "cloudwatch": "cloudwatch_dashboard",
-            "cognito": "cognito_user_pool",
-            "sqs": "sqs_queue",
-            "ssm": "ssm_parameter",
-            "bedrock": "bedrock_agent"
-        }
-        
         # Convert service name to module name
-        module_name = service_map.get(service.lower(), service.lower())
+        service = service.lower()
+        module_name = SERVICE_MODULE_MAP.get(service, service)
         
         # Return the module and class name
         return module_name, class_name
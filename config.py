@@ -1,18 +1,47 @@
 """
 This module defines the data structures for our configuration.
-Currently, the dataclasses are defined for potential future integration
+AWSResource is used by AWSResourceBuilder as the record for each entry
+in aws_resources; Config is defined for potential future integration
 with a configuration parsing/validation library.
 """
 
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field
 from typing import Dict, List, Any
 
-@dataclass
+# __slots__ via dataclass(slots=True) is only available from Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
 class AWSResource:
     name: str
     type: str
-    args: Dict[str, Any]
+    args: Dict[str, Any] = field(default_factory=dict)
     custom_name: str = None
+    existing: bool = False
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AWSResource":
+        """Create a record from a raw aws_resources entry, ignoring unknown keys.
+        
+        The "existing" flag is moved out of args; args is otherwise shared with
+        the raw entry, not copied, and must not be mutated.
+        """
+        for key in ("name", "type"):
+            if key not in data:
+                raise ValueError(f"Missing required key '{key}' in aws_resources entry: {data}")
+        args = data.get("args") or {}
+        existing = False
+        if "existing" in args:
+            existing = bool(args["existing"])
+            args = {k: v for k, v in args.items() if k != "existing"}
+        return cls(
+            name=data["name"],
+            type=data["type"],
+            args=args,
+            custom_name=data.get("custom_name", None),
+            existing=existing,
+        )
 
 @dataclass
 class Config:
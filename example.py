@@ -4,7 +4,6 @@ Example script demonstrating how to use the AWS Terraform CDK infrastructure bui
 This file creates a simple VPC, subnet, and EC2 instance using a YAML configuration.
 """
 
-import yaml
 from awsterraform import AWSResourceBuilder
 from cdktf import App, TerraformStack
 from constructs import Construct
@@ -1,20 +1,77 @@
 #!/usr/bin/env python
-import yaml
+import glob
+import hashlib
+import logging
+import marshal
+import os
 from constructs import Construct
 from cdktf import App, TerraformStack
 from awsterraform import AWSResourceBuilder
 from typing import Any, Dict
 
-def load_config(file_path: str) -> Dict[str, Any]:
-    """Load and validate YAML configuration from the given file path."""
-    with open(file_path, "r") as file:
-        config_data = yaml.safe_load(file)
-    
+logger = logging.getLogger(__name__)
+
+# Parsed configurations are cached here, keyed by a hash of the YAML content
+CONFIG_CACHE_DIR = ".cache"
+
+def validate_config(config_data: Dict[str, Any]) -> None:
+    """Raise ValueError if a required configuration key is missing."""
     # Ensure required keys exist
     required_keys = ["team", "service", "environment", "region"]
     for key in required_keys:
         if key not in config_data:
             raise ValueError(f"Missing required configuration key: {key}")
+
+def load_config(file_path: str) -> Dict[str, Any]:
+    """Load and validate YAML configuration from the given file path."""
+    with open(file_path, "rb") as file:
+        raw = file.read()
+    
+    # Reuse the parsed result of an identical file from a previous run
+    key = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    cache_path = os.path.join(CONFIG_CACHE_DIR, f"config_{key}.marshal")
+    # The cache is a local speed-up that trusts the contents of .cache/; marshal
+    # is not safe against maliciously constructed data. An entry that fails to
+    # load or validate is treated as a miss and the YAML is parsed again.
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached = marshal.load(cache_file)
+        if isinstance(cached, dict):
+            validate_config(cached)
+            return cached
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    
+    import yaml
+    try:
+        # libyaml-backed loader, available when PyYAML was built with it
+        from yaml import CSafeLoader as SafeLoader
+    except ImportError:
+        from yaml import SafeLoader
+    
+    config_data = yaml.load(raw, Loader=SafeLoader)
+    
+    validate_config(config_data)
+    
+    # Configs holding values marshal cannot store (e.g. YAML timestamps) are not cached
+    try:
+        cache_data = marshal.dumps(config_data)
+    except ValueError:
+        return config_data
+    
+    # Write through a temporary file so a partial cache entry is never read
+    try:
+        os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as cache_file:
+            cache_file.write(cache_data)
+        os.replace(tmp_path, cache_path)
+        # Only the entry for the current config is kept (older .pkl entries included)
+        for stale_path in glob.glob(os.path.join(CONFIG_CACHE_DIR, "config_*.*")):
+            if stale_path != cache_path and stale_path.endswith((".marshal", ".pkl")):
+                os.remove(stale_path)
+    except OSError as e:
+        logger.warning("Could not cache configuration: %s", e)
     
     return config_data
 
@@ -32,10 +89,16 @@ class AwsClassicStack(TerraformStack):
             # Build the resources defined in the YAML
             builder.build()
         except Exception as e:
-            print(f"Error in stack creation: {e}")
+            logger.error("Error in stack creation: %s", e)
             raise
 
 def main():
+    # Per-resource progress is logged at DEBUG; set LOG_LEVEL=DEBUG to see it
+    # Unrecognised LOG_LEVEL values fall back to WARNING instead of failing synth
+    level = logging.getLevelName(os.environ.get("LOG_LEVEL", "WARNING").upper())
+    if not isinstance(level, int):
+        level = logging.WARNING
+    logging.basicConfig(level=level, format="%(levelname)s: %(message)s")
     app = App()
     AwsClassicStack(app, "tf-cdk-python-aws")
     app.synth()